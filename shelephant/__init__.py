@@ -5,19 +5,37 @@ Copy with a memory.
 '''
 
 from ._version import *
-from . import checksum
-from . import convert
-from . import detail
-from . import path
-from . import relpath
-from . import rich
-from . import rsync
-from . import scp
-from . import ssh
-from . import yaml
 
+import importlib as _importlib
 
+# Submodules are imported on first use, such that a command-line tool only imports what it uses.
+_submodules = [
+    'checksum',
+    'convert',
+    'detail',
+    'external',
+    'hashcache',
+    'path',
+    'relpath',
+    'rich',
+    'rsync',
+    'scp',
+    'ssh',
+    'yaml',
+]
 
 
+def __getattr__(name):
 
+    try:
+        return _importlib.import_module('.' + name, __name__)
+    except ModuleNotFoundError as e:
+        if e.name != __name__ + '.' + name:
+            raise
 
+    raise AttributeError('module "{0:s}" has no attribute "{1:s}"'.format(__name__, name))
+
+
+def __dir__():
+
+    return sorted(list(globals()) + _submodules)
@@ -4,30 +4,146 @@ Compute checksums.
 (c) Tom de Geus, 2021, MIT
 '''
 
-import numpy as np
 import os
+import stat
+import time
 import tqdm
 
+from . import hashcache
 from .relpath import add_prefix
 from .yaml import read
 
 
-def sha256(filename, size = 2 ** 10):
+def sha256(filename, size = 2 ** 14):
     r'''
 Get sha256 of a file.
+The file is read in chunks of ``size`` blocks into a single reused buffer.
+The file is not memory-mapped: a file that is truncated while it is being read (e.g. because it
+is still being written) would then raise ``SIGBUS`` and kill the process.
+
+Note that ``hashlib`` uses OpenSSL, which dispatches to the SHA extensions of the CPU
+if they are available (unless disabled using ``OPENSSL_ia32cap``).
+
+:param str filename: File-path.
+:param int size: Size of the read buffer, in multiples of the block-size of the hash.
     '''
 
     import hashlib
 
     h = hashlib.sha256()
 
-    with open(filename, 'rb') as f:
-        for byte_block in iter(lambda: f.read(size * h.block_size), b""):
-            h.update(byte_block)
+    with open(filename, 'rb', buffering=0) as f:
+
+        if hasattr(os, 'posix_fadvise'):
+            try:
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            except OSError:
+                pass
+
+        buffer = bytearray(size * h.block_size)
+        view = memoryview(buffer)
+
+        while n := f.readinto(buffer):
+            h.update(view[:n])
+
         return h.hexdigest()
 
 
-def get(filepaths, yaml_hostinfo=None, hybrid=False, progress=False):
+def _prefetch(filename, size = 2 ** 22):
+    r'''
+Advise the OS that the beginning of a file will be read soon, such that it can be read ahead of
+time (if ``os.posix_fadvise`` is supported).
+Only the leading ``size`` bytes are advised, such that prefetching (large) files does not evict
+the file that is being hashed from the page cache.
+Detail for: :py:fun:`_compute`.
+Not part of API.
+    '''
+
+    if not hasattr(os, 'posix_fadvise'):
+        return
+
+    try:
+        fd = os.open(filename, os.O_RDONLY)
+    except OSError:
+        return
+
+    try:
+        os.posix_fadvise(fd, 0, size, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _compute(filepaths, progress=False, workers=None, cache=True):
+    r'''
+Compute the checksums of a list of files.
+For more than a couple of files the checksums are computed in parallel.
+Detail for: :py:fun:`get`.
+Not part of API.
+
+:param list filepaths: List of file-paths.
+:param bool progress: Show a progress-bar.
+:param int workers: Maximum number of worker processes (default: number of CPUs).
+:param bool cache: Read/write checksums from/to :py:mod:`shelephant.hashcache`.
+
+:return:
+    List of checksums, of same length as ``filepaths``.
+    The entry is ``None`` if the path is not a file.
+    '''
+
+    ret = [None for i in range(len(filepaths))]
+    timestamp = time.time_ns()
+    index = []
+    stats = []
+
+    for i, path in enumerate(filepaths):
+        try:
+            st = os.stat(path)
+        except (OSError, ValueError):
+            continue
+        if stat.S_ISREG(st.st_mode):
+            index.append(i)
+            stats.append(st)
+
+    if cache:
+        cached = hashcache.read(stats)
+        for i, h in zip(index, cached):
+            ret[i] = h
+        stats = [st for st, h in zip(stats, cached) if h is None]
+        index = [i for i, h in zip(index, cached) if h is None]
+
+    files = [filepaths[i] for i in index]
+
+    if len(files) <= 16 or workers == 1:
+        data = []
+        window = 8
+        for file in files[:window]:
+            _prefetch(file)
+        for i in (tqdm.trange(len(files), desc='Processing') if progress else range(len(files))):
+            if i + window < len(files):
+                _prefetch(files[i + window])
+            data += [sha256(files[i])]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        # about four tasks per process: balance the load, but limit the overhead per task
+        chunksize = max(1, len(files) // (4 * (workers or os.cpu_count() or 1)))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            data = executor.map(sha256, files, chunksize=chunksize)
+            if progress:
+                data = tqdm.tqdm(data, total=len(files), desc='Processing')
+            data = list(data)
+
+    for i, h in zip(index, data):
+        ret[i] = h
+
+    if cache:
+        hashcache.write(stats, data, timestamp)
+
+    return ret
+
+
+def get(filepaths, yaml_hostinfo=None, hybrid=False, progress=False, workers=None, cache=True):
     r'''
 Compute the checksums of a list of files.
 
@@ -44,6 +160,14 @@ Compute the checksums of a list of files.
 
 :param bool progress: Show a progress-bar.
 
+:param int workers:
+    Maximum number of processes used to compute checksums (default: number of CPUs).
+    Use ``1`` to compute all checksums in the current process.
+
+:param bool cache:
+    Reuse checksums of files that did not change since their checksum was last computed,
+    see :py:mod:`shelephant.hashcache`.
+
 :return:
     List of checksums, of same length as ``filepaths``.
     The entry is ``None`` if no checksum was found/read.
@@ -58,12 +182,7 @@ Compute the checksums of a list of files.
     # Compute
 
     if not yaml_hostinfo:
-
-        for i in tqdm.trange(n, disable=not progress, desc='Processing'):
-            if os.path.isfile(filepaths[i]):
-                ret[i] = sha256(filepaths[i])
-
-        return ret
+        return _compute(filepaths, progress, workers, cache)
 
     # Read pre-computed
 
@@ -73,25 +192,16 @@ Compute the checksums of a list of files.
     check_sums = data['checksum']
     check_paths = add_prefix(prefix, files)
 
-    sorter = np.argsort(filepaths)
-    source_paths = np.array(filepaths)[sorter]
-
-    i = np.argsort(check_paths)
-    check_paths = np.array(check_paths)[i]
-    check_sums = np.array(check_sums)[i]
+    lookup = {}
+    for path, h in zip(check_paths, check_sums):
+        lookup.setdefault(path, h)
 
-    test = np.in1d(source_paths, check_paths)
-    idx = np.searchsorted(check_paths, source_paths)
-    idx = np.where(test, idx, 0)
-    ret = np.where(test, check_sums[idx], None)
-    out = np.empty_like(ret)
-    out[sorter] = ret
-    ret = list(out)
+    ret = [lookup.get(path) for path in filepaths]
 
     if hybrid:
-        for i in tqdm.trange(n, disable=not progress, desc='Processing'):
-            if ret[i] is None:
-                if os.path.isfile(filepaths[i]):
-                    ret[i] = sha256(filepaths[i])
+        index = [i for i in range(n) if ret[i] is None]
+        data = _compute([filepaths[i] for i in index], progress, workers, cache)
+        for i, h in zip(index, data):
+            ret[i] = h
 
     return ret
@@ -23,6 +23,9 @@ The filenames are assumed either absolute, or relative to the input YAML-file.
     -f, --force
         Overwrite output file without prompt.
 
+    --no-cache
+        Compute all checksums, do not use (nor update) the cache of earlier computed checksums.
+
     -q, --quiet
         Do not print progress.
 
@@ -44,7 +47,7 @@ from .. import version
 from .. import yaml
 
 
-def main():
+def main(argv=None):
 
     try:
 
@@ -57,17 +60,18 @@ def main():
         parser.add_argument('-k', '--key', required=False, default='/')
         parser.add_argument('-l', '--local', required=False)
         parser.add_argument('-f', '--force', required=False, action='store_true')
+        parser.add_argument(      '--no-cache', required=False, action='store_true')
         parser.add_argument('-q', '--quiet', required=False, action='store_true')
         parser.add_argument('-v', '--version', action='version', version=version)
         parser.add_argument('input', nargs='?', default='shelephant_dump.yaml')
-        args = parser.parse_args()
+        args = parser.parse_args(argv)
 
         source = args.input
         key = list(filter(None, args.key.split('/')))
         files = yaml.read_item(source, key)
         prefix = os.path.dirname(source)
         files = relpath.add_prefix(prefix, files)
-        data = checksum.get(files, args.local, hybrid=True, progress=not args.quiet)
+        data = checksum.get(files, args.local, hybrid=True, progress=not args.quiet, cache=not args.no_cache)
         yaml.dump(args.output, data, args.force)
 
     except Exception as e:
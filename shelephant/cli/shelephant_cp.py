@@ -44,6 +44,12 @@ The filenames are assumed either absolute, or relative to the input YAML-file.
     -f, --force
         Move without prompt.
 
+    --no-cache
+        Compute all checksums, do not use (nor update) the cache of earlier computed checksums.
+
+    --workers=arg
+        Number of files copied concurrently. [default: 1]
+
     -q, --quiet
         Do not print progress.
 
@@ -57,15 +63,15 @@ The filenames are assumed either absolute, or relative to the input YAML-file.
 '''
 
 import argparse
-import shutil
 import os
 
 from .. import version
 from .. import detail
+from .. import path
 from .. import yaml
 
 
-def main():
+def main(argv=None):
 
     try:
 
@@ -82,10 +88,12 @@ def main():
         parser.add_argument('-s', '--summary', required=False, action='store_true')
         parser.add_argument('-d', '--details', required=False, action='store_true')
         parser.add_argument('-f', '--force', required=False, action='store_true')
+        parser.add_argument(      '--no-cache', required=False, action='store_true')
+        parser.add_argument(      '--workers', required=False, type=int, default=1)
         parser.add_argument('-q', '--quiet', required=False, action='store_true')
         parser.add_argument('-v', '--version', action='version', version=version)
         parser.add_argument('args', nargs='+')
-        args = parser.parse_args()
+        args = parser.parse_args(argv)
 
         if len(args.args) == 1:
             source = 'shelephant_dump.yaml'
@@ -99,7 +107,7 @@ def main():
         key = list(filter(None, args.key.split('/')))
 
         return detail.copy(
-            copy_function = shutil.copy2,
+            copy_function = path.copy,
             files = yaml.read_item(source, key),
             src_dir = os.path.dirname(source),
             dest_dir = dest_dir,
@@ -110,7 +118,9 @@ def main():
             print_details = not (args.force or args.summary) or args.details,
             print_summary = not (args.force or args.details) or args.summary,
             print_all = args.details,
-            theme_name = args.colors.lower())
+            theme_name = args.colors.lower(),
+            cache = not args.no_cache,
+            workers = args.workers)
 
     except Exception as e:
 
@@ -41,11 +41,12 @@ import argparse
 import os
 import subprocess
 
+from .. import relpath
 from .. import version
 from .. import yaml
 
 
-def main():
+def main(argv=None):
 
     try:
 
@@ -62,20 +63,19 @@ def main():
         parser.add_argument('-f', '--force', required=False, action='store_true')
         parser.add_argument('-v', '--version', action='version', version=version)
         parser.add_argument('file', nargs='+')
-        args = parser.parse_args()
+        args = parser.parse_args(argv)
 
         prefix = os.path.dirname(args.output)
         files = args.file
 
         if args.command:
             command = ' '.join(files)
-            files = sorted(list(filter(None, subprocess.check_output(
-                command, shell=True).decode('utf-8').split('\n'))))
+            with subprocess.Popen(command, shell=True, stdout=subprocess.PIPE, encoding='utf-8') as process:
+                files = sorted(filter(None, (line.rstrip('\n') for line in process.stdout)))
+            if process.returncode != 0:
+                raise subprocess.CalledProcessError(process.returncode, command)
 
-        if args.abspath:
-            files = [os.path.abspath(file) for file in files]
-        else:
-            files = [os.path.relpath(file, prefix) for file in files]
+        files = relpath.normalize(files, prefix, args.abspath)
 
         if args.sort:
             files = sorted(files)
@@ -50,7 +50,7 @@ from .. import version
 from .. import yaml
 
 
-def main():
+def main(argv=None):
 
     try:
 
@@ -66,7 +66,7 @@ def main():
         parser.add_argument('-v', '--version', action='version', version=version)
         parser.add_argument('input')
         parser.add_argument('key', nargs='*')
-        args = parser.parse_args()
+        args = parser.parse_args(argv)
 
         input_dir = os.path.dirname(args.input)
         output = args.output if args.output else args.input
@@ -23,6 +23,10 @@ Typically, *rsync* will be faster, especially in copying a lot of small files.
     --scp
         Use ``scp`` instead of ``rysnc`` as backend.
 
+    --workers=arg
+        Number of files copied concurrently (with ``--scp``: number of concurrent ``scp``
+        connections; not used with *rsync*). [default: 1]
+
     --check-rsync
         Check if files are different using *rsync*.
         *rsync* uses basic criteria such as file size and creation and modification date.
@@ -47,6 +51,9 @@ Typically, *rsync* will be faster, especially in copying a lot of small files.
     --verbose
         Verbose all commands.
 
+    --no-cache
+        Compute all checksums, do not use (nor update) the cache of earlier computed checksums.
+
     -q, --quiet
         Do not print progress.
 
@@ -61,16 +68,16 @@ Typically, *rsync* will be faster, especially in copying a lot of small files.
 
 import argparse
 import os
-import shutil
 
 from .. import detail
+from .. import path
 from .. import rsync
 from .. import scp
 from .. import version
 from .. import yaml
 
 
-def main():
+def main(argv=None):
 
     try:
 
@@ -81,6 +88,7 @@ def main():
         parser = Parser()
         parser.add_argument('-l', '--local', required=False)
         parser.add_argument(      '--scp', required=False, action='store_true')
+        parser.add_argument(      '--workers', required=False, type=int, default=1)
         parser.add_argument('-r', '--check-rsync', required=False, action='store_true')
         parser.add_argument(      '--temp', required=False, default='shelephant_files.txt')
         parser.add_argument(      '--colors', required=False, default='dark')
@@ -88,10 +96,11 @@ def main():
         parser.add_argument('-d', '--details', required=False, action='store_true')
         parser.add_argument('-f', '--force', required=False, action='store_true')
         parser.add_argument(      '--verbose', required=False, action='store_true')
+        parser.add_argument(      '--no-cache', required=False, action='store_true')
         parser.add_argument('-q', '--quiet', required=False, action='store_true')
         parser.add_argument('-v', '--version', action='version', version=version)
         parser.add_argument('hostinfo', nargs='?', default='shelephant_hostinfo.yaml')
-        args = parser.parse_args()
+        args = parser.parse_args(argv)
 
         source = args.hostinfo
         data = yaml.read(source)
@@ -99,7 +108,7 @@ def main():
         if 'host' not in data:
 
             detail.copy(
-                copy_function = shutil.copy2,
+                copy_function = path.copy,
                 files = data['files'],
                 src_dir = data['prefix'],
                 dest_dir = os.path.dirname(source),
@@ -111,8 +120,10 @@ def main():
                 print_summary = not (args.force or args.details) or args.summary,
                 print_all = args.details,
                 theme_name = args.colors.lower(),
+                cache = not args.no_cache,
                 yaml_hostinfo_src = source,
-                yaml_hostinfo_dest = args.local)
+                yaml_hostinfo_dest = args.local,
+                workers = args.workers)
 
         elif args.scp:
 
@@ -133,8 +144,10 @@ def main():
                 print_all = args.details,
                 verbose = args.verbose,
                 theme_name = args.colors.lower(),
+                cache = not args.no_cache,
                 yaml_hostinfo_src = source,
-                yaml_hostinfo_dest = args.local)
+                yaml_hostinfo_dest = args.local,
+                workers = args.workers)
 
         else:
 
@@ -155,6 +168,7 @@ def main():
                 print_all = args.details,
                 verbose = args.verbose,
                 theme_name = args.colors.lower(),
+                cache = not args.no_cache,
                 yaml_hostinfo_src = source,
                 yaml_hostinfo_dest = args.local,
                 tempfilename = args.temp)
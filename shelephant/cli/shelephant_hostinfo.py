@@ -56,7 +56,6 @@ import argparse
 import os
 import tempfile
 import shutil
-import numpy as np
 
 from .. import scp
 from .. import version
@@ -65,17 +64,12 @@ from .. import yaml
 
 def remove(data, rm):
 
-    files = np.array(data['files'])
-    sorter = np.argsort(files)
-    files = files[sorter]
-    rm = np.sort(rm)
+    rm = set(rm)
 
-    test = np.in1d(rm, files)
-    if not np.all(np.in1d(rm, files)):
+    if not rm.issubset(data['files']):
         raise IOError('One or more remove paths not found')
 
-    idx = np.searchsorted(files, rm)
-    keep = np.setdiff1d(np.arange(len(files)), sorter[idx])
+    keep = [i for i, file in enumerate(data['files']) if file not in rm]
 
     files = data['files']
     checksum = data['checksum']
@@ -85,7 +79,7 @@ def remove(data, rm):
     return data
 
 
-def main():
+def main(argv=None):
 
     try:
 
@@ -109,7 +103,7 @@ def main():
         parser.add_argument(      '--force', required=False, action='store_true')
         parser.add_argument(      '--verbose', required=False, action='store_true')
         parser.add_argument('-v', '--version', action='version', version=version)
-        args = parser.parse_args()
+        args = parser.parse_args(argv)
 
         # Separate mode: remove paths and quit
 
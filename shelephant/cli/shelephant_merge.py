@@ -58,7 +58,7 @@ def recursive_items(dictionary):
             yield (key, value)
 
 
-def main():
+def main(argv=None):
 
     try:
 
@@ -75,7 +75,7 @@ def main():
         parser.add_argument('-v', '--version', action='version', version=version)
         parser.add_argument('branch')
         parser.add_argument('main')
-        args = parser.parse_args()
+        args = parser.parse_args(argv)
 
         main = yaml.read(args.main)
         branch = yaml.read(args.branch)
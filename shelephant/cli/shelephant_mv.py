@@ -35,6 +35,12 @@ The filenames are assumed either absolute, or relative to the input YAML-file.
     -f, --force
         Move without prompt.
 
+    --no-cache
+        Compute all checksums, do not use (nor update) the cache of earlier computed checksums.
+
+    --workers=arg
+        Number of files copied concurrently. [default: 1]
+
     -q, --quiet
         Do not print progress.
 
@@ -55,7 +61,7 @@ from .. import version
 from .. import yaml
 
 
-def main():
+def main(argv=None):
 
     try:
 
@@ -70,10 +76,12 @@ def main():
         parser.add_argument('-s', '--summary', required=False, action='store_true')
         parser.add_argument('-d', '--details', required=False, action='store_true')
         parser.add_argument('-f', '--force', required=False, action='store_true')
+        parser.add_argument(      '--no-cache', required=False, action='store_true')
+        parser.add_argument(      '--workers', required=False, type=int, default=1)
         parser.add_argument('-q', '--quiet', required=False, action='store_true')
         parser.add_argument('-v', '--version', action='version', version=version)
         parser.add_argument('args', nargs='+')
-        args = parser.parse_args()
+        args = parser.parse_args(argv)
 
         if len(args.args) == 1:
             source = 'shelephant_dump.yaml'
@@ -97,7 +105,9 @@ def main():
             print_details = not (args.force or args.summary) or args.details,
             print_summary = not (args.force or args.details) or args.summary,
             print_all = args.details,
-            theme_name = args.colors.lower())
+            theme_name = args.colors.lower(),
+            cache = not args.no_cache,
+            workers = args.workers)
 
     except Exception as e:
 
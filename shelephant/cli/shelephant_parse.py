@@ -25,7 +25,7 @@ from .. import version
 from .. import yaml
 
 
-def main():
+def main(argv=None):
 
     try:
 
@@ -36,7 +36,7 @@ def main():
         parser = Parser()
         parser.add_argument('-v', '--version', action='version', version=version)
         parser.add_argument('file')
-        args = parser.parse_args()
+        args = parser.parse_args(argv)
 
         data = yaml.read(args.file)
         yaml.view(data)
@@ -37,7 +37,7 @@ from .. import version
 from .. import yaml
 
 
-def main():
+def main(argv=None):
 
     try:
 
@@ -50,7 +50,7 @@ def main():
         parser.add_argument('-f', '--force', required=False, action='store_true')
         parser.add_argument('-v', '--version', action='version', version=version)
         parser.add_argument('input', nargs='?', default='shelephant_dump.yaml')
-        args = parser.parse_args()
+        args = parser.parse_args(argv)
 
         source = args.input
         key = list(filter(None, args.key.split('/')))
@@ -61,8 +61,7 @@ def main():
         if len(files) == 0:
             return 0
 
-        for file in files:
-            print('rm {0:s}'.format(file))
+        print('\n'.join(['rm ' + file for file in files]))
 
         if not args.force:
             if not click.confirm('Proceed?'):
@@ -30,6 +30,10 @@ Typically, *rsync* will be faster, especially in copying a lot of small files.
     --scp
         Use ``scp`` instead of ``rysnc`` as backend.
 
+    --workers=arg
+        Number of files copied concurrently (with ``--scp``: number of concurrent ``scp``
+        connections; not used with *rsync*). [default: 1]
+
     --check-rsync
         Check if files are different using *rsync*.
         *rsync* uses basic criteria such as file size and creation and modification date.
@@ -54,6 +58,9 @@ Typically, *rsync* will be faster, especially in copying a lot of small files.
     --verbose
         Verbose all commands.
 
+    --no-cache
+        Compute all checksums, do not use (nor update) the cache of earlier computed checksums.
+
     -q, --quiet
         Do not print progress.
 
@@ -68,16 +75,16 @@ Typically, *rsync* will be faster, especially in copying a lot of small files.
 
 import argparse
 import os
-import shutil
 
 from .. import detail
+from .. import path
 from .. import rsync
 from .. import scp
 from .. import version
 from .. import yaml
 
 
-def main():
+def main(argv=None):
 
     try:
 
@@ -89,6 +96,7 @@ def main():
         parser.add_argument('-k', '--key', required=False, default='/')
         parser.add_argument('-l', '--local', required=False)
         parser.add_argument(      '--scp', required=False, action='store_true')
+        parser.add_argument(      '--workers', required=False, type=int, default=1)
         parser.add_argument('-r', '--check-rsync', required=False, action='store_true')
         parser.add_argument(      '--temp', required=False, default='shelephant_files.txt')
         parser.add_argument(      '--colors', required=False, default='dark')
@@ -96,10 +104,11 @@ def main():
         parser.add_argument('-d', '--details', required=False, action='store_true')
         parser.add_argument('-f', '--force', required=False, action='store_true')
         parser.add_argument(      '--verbose', required=False, action='store_true')
+        parser.add_argument(      '--no-cache', required=False, action='store_true')
         parser.add_argument('-q', '--quiet', required=False, action='store_true')
         parser.add_argument('-v', '--version', action='version', version=version)
         parser.add_argument('args', nargs='*', default=['shelephant_dump.yaml', 'shelephant_hostinfo.yaml'])
-        args = parser.parse_args()
+        args = parser.parse_args(argv)
 
         if len(args.args) != 2:
             raise IOError('Unknown number of arguments: allowed are 0 or 2 positional arguments')
@@ -115,7 +124,7 @@ def main():
         if 'host' not in data:
 
             detail.copy(
-                copy_function = shutil.copy2,
+                copy_function = path.copy,
                 files = files,
                 src_dir = src_dir,
                 dest_dir = data['prefix'],
@@ -127,8 +136,10 @@ def main():
                 print_summary = not (args.force or args.details) or args.summary,
                 print_all = args.details,
                 theme_name = args.colors.lower(),
+                cache = not args.no_cache,
                 yaml_hostinfo_src = args.local,
-                yaml_hostinfo_dest = hostinfo)
+                yaml_hostinfo_dest = hostinfo,
+                workers = args.workers)
 
         elif args.scp:
 
@@ -149,8 +160,10 @@ def main():
                 print_all = args.details,
                 verbose = args.verbose,
                 theme_name = args.colors.lower(),
+                cache = not args.no_cache,
                 yaml_hostinfo_src = args.local,
-                yaml_hostinfo_dest = hostinfo)
+                yaml_hostinfo_dest = hostinfo,
+                workers = args.workers)
 
         else:
 
@@ -171,6 +184,7 @@ def main():
                 print_all = args.details,
                 verbose = args.verbose,
                 theme_name = args.colors.lower(),
+                cache = not args.no_cache,
                 yaml_hostinfo_src = args.local,
                 yaml_hostinfo_dest = hostinfo,
                 tempfilename = args.temp)
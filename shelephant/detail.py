@@ -6,12 +6,14 @@ Not part of public API.
 '''
 
 
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
 import click
-import numpy as np
 import os
 import tqdm
 
 from .checksum import get
+from .path import isfile
 from .path import makedirs
 from .relpath import add_prefix
 from .rich import String
@@ -20,6 +22,28 @@ from .rsync import diff
 from .yaml import read
 
 
+def _wait(futures, quiet=False):
+    r'''
+Wait for copies to finish (showing progress).
+On the first error all copies that did not start yet are cancelled, and the error is raised.
+Detail for: :py:fun:`copy` and :py:fun:`copy_ssh`.
+Not part of API.
+
+:param list futures: List of ``concurrent.futures.Future``.
+:param bool quiet: Proceed without printing progress.
+    '''
+
+    done = as_completed(futures)
+
+    try:
+        for future in (done if quiet else tqdm.tqdm(done, total=len(futures))):
+            future.result()
+    except BaseException:
+        for future in futures:
+            future.cancel()
+        raise
+
+
 def copy(
     copy_function,
     files,
@@ -34,7 +58,9 @@ def copy(
     print_all = False,
     theme_name = 'none',
     yaml_hostinfo_src = None,
-    yaml_hostinfo_dest = None):
+    yaml_hostinfo_dest = None,
+    workers = None,
+    cache = True):
     r'''
 Copy/move files.
 
@@ -68,6 +94,12 @@ Copy/move files.
 :param yaml_hostinfo_dest:
     Filename of hostinfo for the destination, see :py:mod:`shelephant.cli.hostinfo`.
     Specify these files *only* to use precomputed checksums.
+
+:param int workers:
+    Maximum number of files copied concurrently (by default chosen by ``ThreadPoolExecutor``).
+    Use ``1`` to copy the files one-by-one.
+
+:param bool cache: Use the cache of earlier computed checksums, see :py:mod:`shelephant.hashcache`.
     '''
 
     assert type(files) == list
@@ -87,11 +119,19 @@ Copy/move files.
     skip = [False for i in range(n)]
     color = theme(theme_name.lower())
 
-    for file in src:
-        if not os.path.isfile(file):
+    dest_isdir = os.path.isdir(dest_dir)
+
+    # check the source and the destination concurrently (both may be on slow mounts)
+    with ThreadPoolExecutor(2) as executor:
+        src_exists = executor.submit(isfile, src)
+        if dest_isdir and check_rsync is None:
+            dest_exists = executor.submit(isfile, dest)
+
+    for file, exists in zip(src, src_exists.result()):
+        if not exists:
             raise IOError('Input file "{0:s}" does not exists'.format(file))
 
-    if not os.path.isdir(dest_dir):
+    if not dest_isdir:
 
         create = [True for i in range(n)]
 
@@ -111,21 +151,27 @@ Copy/move files.
 
     else:
 
+        dest_exists = dest_exists.result()
+
         if checksum:
-            src_checksums = get(src, yaml_hostinfo_src, progress=not quiet)
-            dest_checksums = get(dest, yaml_hostinfo_dest, progress=not quiet)
+            # files of different size differ: only compare checksums of files of equal size
+            index = [i for i in range(n) if dest_exists[i]]
+            index = [i for i in index if os.stat(src[i]).st_size == os.stat(dest[i]).st_size]
+            src_checksums = get([src[i] for i in index], yaml_hostinfo_src, progress=not quiet, cache=cache)
+            dest_checksums = get([dest[i] for i in index], yaml_hostinfo_dest, progress=not quiet, cache=cache)
+            for i, src_checksum, dest_checksum in zip(index, src_checksums, dest_checksums):
+                if src_checksum is not None and src_checksum == dest_checksum:
+                    skip[i] = True
 
         for i in range(n):
-            if os.path.isfile(dest[i]):
-                if checksum:
-                    if (src_checksums[i] == dest_checksums[i]) and (src_checksums[i] is not None):
-                        skip[i] = True
-                        continue
+            if skip[i]:
+                continue
+            if dest_exists[i]:
                 overwrite[i] = True
                 continue
             create[i] = True
 
-    l = max([len(file) for file in files])
+    l = max(map(len, files))
     ncreate = sum(create)
     noverwrite = sum(overwrite)
     nskip = sum(skip)
@@ -152,33 +198,46 @@ Copy/move files.
         print('\n'.join(summary))
         print('-----')
 
-    if print_details:
-        for i in range(n):
-            if create[i] and pcreate:
-                print('{0:s} {1:s} {2:s}'.format(
+    arrow_create = String('->', color=color['bright']).format()
+    arrow_skip = String('==', color=color['skip']).format()
+    arrow_overwrite = String('=>', color=color['bright']).format()
+    lines = []
+    keep = []
+
+    for i in range(n):
+        if create[i]:
+            keep += [i]
+            if print_details and pcreate:
+                lines += ['{0:s} {1:s} {2:s}'.format(
                     String(files[i], width=l, color=color['bright']).format(),
-                    String('->', color=color['bright']).format(),
+                    arrow_create,
                     String(files[i], color=color['new']).format()
-                ))
-            elif skip[i] and pskip:
-                print('{0:s} {1:s} {2:s}'.format(
+                )]
+        elif skip[i]:
+            if print_details and pskip:
+                lines += ['{0:s} {1:s} {2:s}'.format(
                     String(files[i], width=l, color=color['skip']).format(),
-                    String('==', color=color['skip']).format(),
+                    arrow_skip,
                     String(files[i], color=color['skip']).format()
-                ))
-            elif overwrite[i]:
-                print('{0:s} {1:s} {2:s}'.format(
+                )]
+        elif overwrite[i]:
+            keep += [i]
+            if print_details:
+                lines += ['{0:s} {1:s} {2:s}'.format(
                     String(files[i], width=l, color=color['bright']).format(),
-                    String('=>', color=color['bright']).format(),
+                    arrow_overwrite,
                     String(files[i], color=color['overwrite']).format()
-                ))
+                )]
+
+    if len(lines) > 0:
+        print('\n'.join(lines))
 
     if ncreate + noverwrite > 100 and print_summary:
         print('-----')
         print('\n'.join(summary))
         print('-----')
 
-    if all(skip):
+    if len(keep) == 0:
         return 0
 
     if not force:
@@ -187,13 +246,14 @@ Copy/move files.
 
     makedirs(list(set([os.path.dirname(i) for i in dest])), force=force)
 
-    i = np.argwhere(np.not_equal(skip, True)).ravel()
-    src = np.array(src)[i]
-    dest = np.array(dest)[i]
-    files = np.array(files)[i]
+    if workers == 1 or len(keep) <= 16:
+        for i in (keep if quiet else tqdm.tqdm(keep)):
+            copy_function(src[i], dest[i])
+        return
 
-    for i in tqdm.trange(len(files), disable=quiet):
-        copy_function(src[i], dest[i])
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(copy_function, src[i], dest[i]) for i in keep]
+        _wait(futures, quiet)
 
 
 def copy_ssh(
@@ -215,7 +275,9 @@ def copy_ssh(
     theme_name = 'none',
     yaml_hostinfo_src = None,
     yaml_hostinfo_dest = None,
-    tempfilename = None):
+    tempfilename = None,
+    workers = 1,
+    cache = True):
     r'''
 Get/send files.
 
@@ -254,6 +316,15 @@ Get/send files.
     Specify these files *only* to use precomputed checksums.
 
 :param str tempfilename: Filename for temporary file to use (e.g. for ``rsync``).
+
+:param int workers:
+    Number of files copied concurrently if ``use_rsync = False``
+    (each copy is a separate call to ``copy_function``, e.g. a separate ``scp`` connection).
+    By default files are copied one-by-one: concurrent copies cannot share a password prompt,
+    and their ``verbose`` output interleaves.
+    Use ``None`` to let ``ThreadPoolExecutor`` choose (as in :py:fun:`copy`).
+
+:param bool cache: Use the cache of earlier computed checksums, see :py:mod:`shelephant.hashcache`.
     '''
 
     assert type(files) == list
@@ -295,32 +366,30 @@ Get/send files.
 
     else:
 
-        if checksum == True:
-            src_checksums = get(src, yaml_hostinfo_src, progress=not quiet)
-            dest_checksums = get(dest, yaml_hostinfo_dest, progress=not quiet)
-
         if to_remote:
             if yaml_hostinfo_dest:
-                f = read(yaml_hostinfo_dest)['files']
-                for i in range(n):
-                    if files[i] in f:
-                        dest_exists[i] = True
+                f = set(read(yaml_hostinfo_dest)['files'])
+                dest_exists = [file in f for file in files]
         elif not to_remote:
-            for i in range(n):
-                if os.path.isfile(dest[i]):
-                    dest_exists[i] = True
+            dest_exists = isfile(dest)
+
+        if checksum:
+            index = [i for i in range(n) if dest_exists[i]]
+            src_checksums = get([src[i] for i in index], yaml_hostinfo_src, progress=not quiet, cache=cache)
+            dest_checksums = get([dest[i] for i in index], yaml_hostinfo_dest, progress=not quiet, cache=cache)
+            for i, src_checksum, dest_checksum in zip(index, src_checksums, dest_checksums):
+                if src_checksum is not None and src_checksum == dest_checksum:
+                    skip[i] = True
 
         for i in range(n):
+            if skip[i]:
+                continue
             if dest_exists[i]:
-                if checksum:
-                    if (src_checksums[i] == dest_checksums[i]) and (src_checksums[i] is not None):
-                        skip[i] = True
-                        continue
                 overwrite[i] = True
                 continue
             create[i] = True
 
-    l = max([len(file) for file in files])
+    l = max(map(len, files))
     ncreate = sum(create)
     noverwrite = sum(overwrite)
     nskip = sum(skip)
@@ -353,33 +422,46 @@ Get/send files.
         print('\n'.join(summary))
         print('-----')
 
-    if print_details:
-        for i in range(n):
-            if create[i] and pcreate:
-                print('{0:s} {1:s} {2:s}'.format(
+    arrow_create = String('->', color=color['bright']).format()
+    arrow_skip = String('==', color=color['skip']).format()
+    arrow_overwrite = String('=>', color=color['bright']).format()
+    lines = []
+    keep = []
+
+    for i in range(n):
+        if create[i]:
+            keep += [i]
+            if print_details and pcreate:
+                lines += ['{0:s} {1:s} {2:s}'.format(
                     String(files[i], width=l, color=color['bright']).format(),
-                    String('->', color=color['bright']).format(),
+                    arrow_create,
                     String(files[i], color=color['new']).format()
-                ))
-            elif skip[i] and pskip:
-                print('{0:s} {1:s} {2:s}'.format(
+                )]
+        elif skip[i]:
+            if print_details and pskip:
+                lines += ['{0:s} {1:s} {2:s}'.format(
                     String(files[i], width=l, color=color['skip']).format(),
-                    String('==', color=color['skip']).format(),
+                    arrow_skip,
                     String(files[i], color=color['skip']).format()
-                ))
-            elif overwrite[i]:
-                print('{0:s} {1:s} {2:s}'.format(
+                )]
+        elif overwrite[i]:
+            keep += [i]
+            if print_details:
+                lines += ['{0:s} {1:s} {2:s}'.format(
                     String(files[i], width=l, color=color['bright']).format(),
-                    String('=>', color=color['bright']).format(),
+                    arrow_overwrite,
                     String(files[i], color=color['overwrite']).format()
-                ))
+                )]
+
+    if len(lines) > 0:
+        print('\n'.join(lines))
 
     if ncreate + noverwrite > 100 and print_summary:
         print('-----')
         print('\n'.join(summary))
         print('-----')
 
-    if all(skip):
+    if len(keep) == 0:
         return 0
 
     if not force:
@@ -389,15 +471,24 @@ Get/send files.
     if not to_remote:
         makedirs(list(set([os.path.dirname(i) for i in dest])), force=force)
 
-    i = np.argwhere(np.not_equal(skip, True)).ravel()
-    src = np.array(src)[i]
-    dest = np.array(dest)[i]
-    files = np.array(files)[i]
+    src = [src[i] for i in keep]
+    dest = [dest[i] for i in keep]
+    files = [files[i] for i in keep]
 
     if use_rsync:
         return copy_function(host, src_dir, dest_dir, tempfilename, files, force, verbose, not quiet)
 
-    pbar = tqdm.trange(len(files), disable=quiet)
-    for i in pbar:
-        pbar.set_description(files[i])
-        copy_function(host, src[i], dest[i], verbose)
+    if workers == 1 or (workers is not None and len(files) <= workers):
+        if quiet:
+            for i in range(len(files)):
+                copy_function(host, src[i], dest[i], verbose)
+            return
+        pbar = tqdm.trange(len(files))
+        for i in pbar:
+            pbar.set_description(files[i])
+            copy_function(host, src[i], dest[i], verbose)
+        return
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(copy_function, host, s, d, verbose) for s, d in zip(src, dest)]
+        _wait(futures, quiet)
@@ -0,0 +1,132 @@
+r'''
+Persistent cache of checksums.
+
+The checksum of a file is stored along with its device, inode, size, modification time,
+and status-change time.
+A stored checksum is only used if none of these changed since it was computed.
+In particular, the status-change time changes on every write and every change of the
+modification time (e.g. by ``touch -r`` or ``rsync -t``), and it cannot be set by the user.
+
+By default the cache is stored in ``$XDG_CACHE_HOME/shelephant/checksum.sqlite``
+(``$XDG_CACHE_HOME`` defaults to ``~/.cache``).
+The cache-file is only created once there is something to write.
+The cache is silently skipped if it cannot be read or written.
+
+(c) Tom de Geus, 2021, MIT
+'''
+
+import os
+import sqlite3
+import time
+
+
+def filename():
+    r'''
+Get the path of the cache-file.
+    '''
+
+    root = os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache'))
+    return os.path.join(root, 'shelephant', 'checksum.sqlite')
+
+
+# Version of the layout of the cache, a cache with a different layout is discarded.
+_layout = 2
+
+
+def _connect():
+    r'''
+Open (and create if needed) the cache.
+Detail for: :py:fun:`read` and :py:fun:`write`.
+Not part of API.
+    '''
+
+    path = filename()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    con = sqlite3.connect(path, timeout=10)
+
+    try:
+        if con.execute('PRAGMA user_version').fetchone()[0] != _layout:
+            with con:
+                con.execute('DROP TABLE IF EXISTS sha256')
+                con.execute(
+                    'CREATE TABLE sha256 ('
+                    'dev INTEGER, ino INTEGER, size INTEGER, mtime_ns INTEGER, ctime_ns INTEGER, '
+                    'sha256 TEXT, PRIMARY KEY (dev, ino))')
+                con.execute('PRAGMA user_version = {0:d}'.format(_layout))
+    except sqlite3.Error:
+        con.close()
+        raise
+
+    return con
+
+
+def read(stats):
+    r'''
+Read checksums from the cache.
+
+:param list stats: List of ``os.stat_result`` of the files.
+
+:return:
+    List of checksums, of same length as ``stats``.
+    The entry is ``None`` if no valid checksum was found.
+    '''
+
+    ret = [None for i in range(len(stats))]
+
+    if len(stats) == 0 or not os.path.isfile(filename()):
+        return ret
+
+    try:
+        con = _connect()
+    except (OSError, sqlite3.Error):
+        return ret
+
+    try:
+        for i, st in enumerate(stats):
+            row = con.execute(
+                'SELECT size, mtime_ns, ctime_ns, sha256 FROM sha256 WHERE dev = ? AND ino = ?',
+                (st.st_dev, st.st_ino)).fetchone()
+            if row and row[:3] == (st.st_size, st.st_mtime_ns, st.st_ctime_ns):
+                ret[i] = row[3]
+    except sqlite3.Error:
+        pass
+    finally:
+        con.close()
+
+    return ret
+
+
+def write(stats, checksums, timestamp=None):
+    r'''
+Write checksums to the cache.
+
+Files that were modified (or changed status) less than two seconds before they were stat-ed
+are skipped: a later modification might not change their timestamps (depending on the
+resolution of the file-system's timestamps).
+
+:param list stats: List of ``os.stat_result`` of the files (taken before computing the checksums).
+:param list checksums: List of checksums.
+:param int timestamp: Time at which the files were stat-ed, see ``time.time_ns`` (default: now).
+    '''
+
+    now = timestamp if timestamp is not None else time.time_ns()
+    rows = [
+        (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns, h)
+        for st, h in zip(stats, checksums)
+        if h is not None and now - max(st.st_mtime_ns, st.st_ctime_ns) > 2e9]
+
+    if len(rows) == 0:
+        return
+
+    try:
+        con = _connect()
+    except (OSError, sqlite3.Error):
+        return
+
+    try:
+        with con:
+            con.executemany('INSERT OR REPLACE INTO sha256 VALUES (?, ?, ?, ?, ?, ?)', rows)
+    except sqlite3.Error:
+        pass
+    finally:
+        con.close()
@@ -4,9 +4,16 @@ FIle operations.
 (c) Tom de Geus, 2021, MIT
 '''
 
+from collections import Counter
 from collections import defaultdict
 import click
+import errno
 import os
+import shutil
+import sys
+
+# File systems that are (by default) case- or normalisation-insensitive (e.g. APFS, NTFS).
+_insensitive = sys.platform in ('darwin', 'win32')
 
 def _to_tree(d):
     r'''
@@ -69,6 +76,76 @@ Uses: ``os.path.isfile``.
             raise IOError('"{0:s}" does not exist'.format(path))
 
 
+def isfile(paths):
+    r'''
+Check for a list of paths if they point to existing files.
+Equivalent to ``[os.path.isfile(path) for path in paths]``, but directories from which
+many paths are checked are read only once (using ``os.scandir``) instead of stat-ing every path.
+Directories from which only a few paths are checked, or that contain many more entries
+than the number of paths checked, are not read.
+On macOS and Windows, paths that are not found by name in a directory listing are stat-ed
+nonetheless, as they may still exist on case- or normalisation-insensitive file systems
+(e.g. ``Foo.txt`` for ``foo.txt``).
+Paths that occur more than once are checked only once.
+Nothing is cached between calls: the result reflects the file system at the time of the call.
+
+:param list paths: List of file paths.
+:return: List of bool.
+    '''
+
+    if type(paths) == str:
+        paths = [paths]
+
+    split = [os.path.split(path) for path in paths]
+    entries = {}
+    missing = set()
+
+    for dirname, n in Counter([dirname for dirname, _ in split]).items():
+
+        entries[dirname] = None
+
+        if n < 8:
+            continue
+
+        try:
+            with os.scandir(dirname if dirname else '.') as it:
+                entries[dirname] = {}
+                for entry in it:
+                    if len(entries[dirname]) > 10 * n:
+                        entries[dirname] = None
+                        break
+                    entries[dirname][entry.name] = entry
+        except FileNotFoundError:
+            missing.add(dirname)
+        except OSError:
+            entries[dirname] = None
+
+    ret = []
+    known = {}
+
+    for path, (dirname, name) in zip(paths, split):
+
+        if dirname in missing:
+            ret += [False]
+            continue
+
+        entry = entries[dirname].get(name) if entries[dirname] is not None else None
+
+        if entry is not None:
+            ret += [entry.is_file()]
+            continue
+
+        if entries[dirname] is not None and not _insensitive:
+            ret += [False]
+            continue
+
+        if path not in known:
+            known[path] = os.path.isfile(path)
+        ret += [known[path]]
+
+    return ret
+
+
 def dirnames(paths, return_unique=True):
     r'''
 Get the ``os.path.dirname`` of all file paths.
@@ -101,7 +178,7 @@ def overwrite(paths, force=False):
     if type(paths) == str:
         paths = [paths]
 
-    ret = [path for path in paths if os.path.isfile(path)]
+    ret = [path for path, exists in zip(paths, isfile(paths)) if exists]
 
     if force or len(ret) == 0:
         return ret
@@ -114,6 +191,44 @@ def overwrite(paths, force=False):
     return ret
 
 
+def copy(source, dest):
+    r'''
+Copy a file and its metadata, like ``shutil.copy2``.
+If ``os.copy_file_range`` is available (Linux), the data is copied by the kernel without
+passing through user space, using reflinks (copy-on-write) on file systems that support it
+(e.g. Btrfs, XFS).
+If that fails, or if ``os.copy_file_range`` is not available, ``shutil.copy2`` is used
+(as it is for files of which the size is not known, such as empty files).
+
+:param str source: Source file-path.
+:param str dest: Destination file-path.
+:return: The destination file-path.
+    '''
+
+    if not hasattr(os, 'copy_file_range'):
+        return shutil.copy2(source, dest)
+
+    if os.access(dest, os.F_OK) and os.path.samefile(source, dest):
+        raise shutil.SameFileError('"{0:s}" and "{1:s}" are the same file'.format(source, dest))
+
+    if os.stat(source).st_size == 0:
+        return shutil.copy2(source, dest)
+
+    try:
+        with open(source, 'rb') as fsrc, open(dest, 'wb') as fdst:
+            if os.copy_file_range(fsrc.fileno(), fdst.fileno(), 2 ** 30) == 0:
+                raise OSError(errno.EINVAL, 'Nothing copied')
+            while os.copy_file_range(fsrc.fileno(), fdst.fileno(), 2 ** 30) > 0:
+                pass
+    except OSError as e:
+        if e.errno not in [errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EBADF]:
+            raise
+        return shutil.copy2(source, dest)
+
+    shutil.copystat(source, dest)
+    return dest
+
+
 def makedirs(dirnames, force=False):
     r'''
 (Prompt and) Create directories that do not yet exist.
@@ -135,8 +250,7 @@ This function creates parent directories if needed.
     dirnames = sorted(filter_deepest(dirnames))
 
     if not force:
-        for dirname in dirnames:
-            print('mkdir -p {0:s}'.format(dirname))
+        print('\n'.join(['mkdir -p ' + dirname for dirname in dirnames]))
         if not click.confirm('Proceed?'):
             raise IOError('Cancelled')
 
@@ -46,3 +46,27 @@ Skip if all paths are absolute paths.
         return files
 
     return [os.path.normpath(os.path.join(prefix, file)) for file in files]
+
+
+def normalize(files, root='', abspath=False):
+    r'''
+Express a list of paths as absolute paths, or relative to a root.
+Equivalent to ``[os.path.abspath(file) for file in files]`` or to
+``[os.path.relpath(file, root) for file in files]``,
+but the current working directory is looked-up only once.
+
+:param list files: List of paths.
+:param str root: Root of the relative paths (ignored if ``abspath = True``).
+:param bool abspath: Return absolute paths.
+:return: List of paths.
+    '''
+
+    cwd = os.getcwd()
+    files = [file if os.path.isabs(file) else os.path.join(cwd, file) for file in files]
+
+    if abspath:
+        return [os.path.normpath(file) for file in files]
+
+    root = os.path.normpath(os.path.join(cwd, root))
+
+    return [os.path.relpath(file, root) for file in files]
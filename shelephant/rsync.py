@@ -5,7 +5,6 @@ Copy & query using *rsync*.
 '''
 
 import click
-import numpy as np
 import os
 import re
 import subprocess
@@ -13,6 +12,10 @@ import tqdm
 
 from .external import exec_cmd
 
+# Line of ``rsync -P`` output that signals that a file was transferred.
+_transferred = re.compile(r'(.*)(xf)([e]?)(r\#)([0-9])(.*)(to\-ch)([e]?[c]?)(k\=)([0-9])(.*)')
+
+
 def _rsync(
     source_dir,
     dest_dir,
@@ -40,7 +43,8 @@ Copy files to a destination using ``rsync -a --files-from``.
             if not click.confirm('Overwrite "{0:s}"?'.format(tempfilename)):
                 raise IOError('Cancelled')
 
-    open(tempfilename, 'w').write('\n'.join(files))
+    with open(tempfilename, 'w') as file:
+        file.write('\n'.join(files))
 
     # Run without printing output
 
@@ -62,14 +66,16 @@ Copy files to a destination using ``rsync -a --files-from``.
     pbar = tqdm.tqdm(total=len(files))
     sbar = tqdm.tqdm(unit='B', unit_scale=True)
 
-    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, shell=True)
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, shell=True) as process:
+        for line in iter(process.stdout.readline, b''):
+            line = line.decode("utf-8")
+            if _transferred.match(line):
+                e = int(list(filter(None, line.split(" ")))[-6].replace(",", ""))
+                pbar.update()
+                sbar.update(e)
 
-    for line in iter(process.stdout.readline, b''):
-        line = line.decode("utf-8")
-        if re.match(r'(.*)(xf)([e]?)(r\#)([0-9])(.*)(to\-ch)([e]?[c]?)(k\=)([0-9])(.*)', line):
-            e = int(list(filter(None, line.split(" ")))[-6].replace(",", ""))
-            pbar.update()
-            sbar.update(e)
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, cmd)
 
 
 def from_remote(
@@ -136,6 +142,21 @@ Copy files to a remote system. Uses: ``rsync -a --files-from``.
         progress = progress)
 
 
+def _split(status):
+    r'''
+Split a list with the status of each file (0 = skip, 1 = create, 2 = overwrite)
+in lists of booleans per status.
+Detail for: :py:fun:`diff`.
+Not part of API.
+    '''
+
+    return {
+        'skip' : [i == 0 for i in status],
+        'create' : [i == 1 for i in status],
+        'overwrite' : [i == 2 for i in status],
+    }
+
+
 def diff(
     source_dir,
     dest_dir,
@@ -168,7 +189,8 @@ See `rsync manual <https://www.samba.org/ftp/rsync/rsync.html>`_.
             if not click.confirm('Overwrite "{0:s}"?'.format(tempfilename)):
                 raise IOError('Cancelled')
 
-    open(tempfilename, 'w').write('\n'.join(files))
+    with open(tempfilename, 'w') as file:
+        file.write('\n'.join(files))
 
     # Run without printing output
 
@@ -183,45 +205,20 @@ See `rsync manual <https://www.samba.org/ftp/rsync/rsync.html>`_.
     lines = list(filter(None, exec_cmd(cmd, verbose).split('\n')))
     lines = [line for line in lines if line[1] == 'f']
 
-    if len(lines) == 0:
-        return {
-            'skip' : np.ones((len(files)), dtype=np.bool),
-            'create' : np.zeros((len(files)), dtype=np.bool),
-            'overwrite' : np.zeros((len(files)), dtype=np.bool),
-        }
+    # status per file: 0 = skip, 1 = create, 2 = overwrite
 
-    check_paths = [line.split(' ')[1] for line in lines]
-    mode = np.zeros((len(check_paths)), dtype=np.int16)
+    status = {}
 
-    for i, line in enumerate(lines):
+    for line in lines:
         if line[0] == '>':
             if line[2] == '+':
-                mode[i] = 1 # create
+                mode = 1 # create
             else:
-                mode[i] = 2 # overwrite
+                mode = 2 # overwrite
         elif line[0] == '.':
-            pass
+            mode = 0
         else:
             raise IOError('Unknown cryptic output "{0:s}"'.format(line))
+        status.setdefault(line.split(' ')[1], mode)
 
-    sorter = np.argsort(files)
-    source_paths = np.array(files, dtype=str)[sorter]
-
-    i = np.argsort(check_paths)
-    check_paths = np.array(check_paths, dtype=str)[i]
-    mode = mode[i]
-
-    test = np.in1d(source_paths, check_paths)
-
-    idx = np.searchsorted(check_paths, source_paths)
-    idx = np.where(test, idx, 0)
-    ret = np.where(test, mode[idx], 0)
-    ret = ret.astype(np.int16)
-    out = np.empty_like(ret)
-    out[sorter] = ret
-
-    return {
-        'skip' : out == 0,
-        'create' : out == 1,
-        'overwrite' : out == 2,
-    }
+    return _split([status.get(file, 0) for file in files])
@@ -5,27 +5,79 @@ Yaml IO.
 '''
 
 import yaml
-import click
 import os
 
 from . import convert
 
+try:
+    from yaml import CFullLoader as _Loader
+    from yaml import CDumper as _Dumper
+except ImportError:
+    from yaml import FullLoader as _Loader
+    from yaml import Dumper as _Dumper
+
 
 def read(filename):
     r'''
 Read YAML file and return its content.
+Uses the LibYAML based parser if PyYAML was built with it.
     '''
 
     if not os.path.isfile(filename):
         raise IOError('"{0:s} does not exist'.format(filename))
 
     with open(filename, 'r') as file:
-        return yaml.load(file.read(), Loader=yaml.FullLoader)
+        return yaml.load(file, Loader=_Loader)
+
+
+def _read_node(filename, key):
+    r'''
+Read an item from a YAML file, while constructing Python objects only for that item.
+The document is composed to a node-graph (without constructing any data),
+which is used to locate the item.
+Detail for: :py:fun:`read_item`.
+Not part of API.
+
+:param list key: The item to read (non-empty).
+:return: The read item.
+    '''
+
+    with open(filename, 'r') as file:
+
+        loader = _Loader(file)
+
+        try:
+            node = loader.get_single_node()
+
+            if not isinstance(node, yaml.MappingNode):
+                raise IOError('"{0:s}" not in "{1:s}"'.format('/'.join(key), filename))
+
+            for k in key:
+
+                if not isinstance(node, yaml.MappingNode):
+                    raise IOError('"{0:s}" not found'.format('/'.join(key)))
+
+                if any(n.tag == 'tag:yaml.org,2002:merge' for n, _ in node.value):
+                    return convert.get(read(filename), key)
+
+                value = [v for n, v in node.value if n.tag == 'tag:yaml.org,2002:str' and n.value == k]
+
+                if len(value) == 0:
+                    raise IOError('"{0:s}" not found'.format('/'.join(key)))
+
+                node = value[-1]
+
+            return loader.construct_document(node)
+
+        finally:
+            loader.dispose()
 
 
 def read_item(filename, key=[]):
     r'''
 Get an item from a YAML file.
+Only the requested item is converted to Python objects,
+the rest of the file is only parsed.
 
 :type key: str or list
 :param key:
@@ -40,14 +92,18 @@ Get an item from a YAML file.
     The read item.
     '''
 
-    data = read(filename)
+    key = convert.split_key(key)
 
-    if type(data) == dict:
-        return convert.get(data, key)
+    if len(key) > 0:
 
-    key = convert.split_key(key)
+        if not os.path.isfile(filename):
+            raise IOError('"{0:s} does not exist'.format(filename))
+
+        return _read_node(filename, key)
 
-    if type(data) == list and len(key) == 0:
+    data = read(filename)
+
+    if type(data) == dict or type(data) == list:
         return data
 
     raise IOError('"{0:s}" not in "{1:s}"'.format('/'.join(key), filename))
@@ -70,6 +126,8 @@ Dump data to YAML file.
     dirname = os.path.dirname(filename)
 
     if not force:
+        import click
+
         if os.path.isfile(filename):
             if not click.confirm('Overwrite "{0:s}"?'.format(filename)):
                 raise IOError('Cancelled')
@@ -81,12 +139,12 @@ Dump data to YAML file.
         os.makedirs(os.path.dirname(filename))
 
     with open(filename, 'w') as file:
-        ret = yaml.dump(data, file)
+        ret = yaml.dump(data, file, Dumper=_Dumper)
 
 
 def view(data):
     r'''
 Print data formatted as YAML.
     '''
-    print(yaml.dump(data, default_flow_style=False, default_style=''))
+    print(yaml.dump(data, Dumper=_Dumper, default_flow_style=False, default_style=''))
 
@@ -0,0 +1,58 @@
+r'''
+Helpers shared by the test scripts.
+'''
+
+import contextlib
+import glob
+import importlib
+import io
+import os
+import shlex
+import subprocess
+
+
+def run(cmd, verbose=False):
+    r'''
+Run a command-line tool in the current process (no shell, no new interpreter), return its output.
+Wildcards are expanded as the shell would.
+Commands that use command substitution are run in a shell.
+
+:param str cmd: The command.
+:param bool verbose: Print the command before running it.
+:throw: subprocess.CalledProcessError
+    '''
+
+    if verbose:
+        print(cmd)
+
+    if '`' in cmd or '$(' in cmd:
+        return subprocess.check_output(cmd, shell=True).decode('utf-8')
+
+    argv = []
+
+    for arg in shlex.split(cmd):
+        matches = sorted(glob.glob(arg)) if glob.has_magic(arg) else []
+        argv += matches if len(matches) > 0 else [arg]
+
+    module = importlib.import_module('shelephant.cli.' + argv[0])
+
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        ret = module.main(argv[1:])
+
+    if ret:
+        raise subprocess.CalledProcessError(ret, cmd, output.getvalue())
+
+    return output.getvalue()
+
+
+def put(path, text):
+    r'''
+Write a (small) file with a single ``os.write``.
+    '''
+
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+
+    try:
+        os.write(fd, text.encode('utf-8'))
+    finally:
+        os.close(fd)
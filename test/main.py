@@ -1,16 +1,50 @@
 import unittest
+import unittest.mock
+import concurrent.futures
+import contextlib
+import hashlib
 import subprocess
 import os
 import shutil
+import tempfile
+import time
 import numpy as np
 import shelephant
 
+from _helpers import put
+from _helpers import run
 
-def run(cmd, verbose=False):
-    return subprocess.check_output(cmd, shell=True).decode('utf-8')
 
+@contextlib.contextmanager
+def tempdir():
+    r'''
+Change the working directory to a temporary directory (on ``/dev/shm`` if available).
+The directory is removed on exit.
+    '''
 
-class Test_tools(unittest.TestCase):
+    origin = os.getcwd()
+    dirname = tempfile.mkdtemp(dir='/dev/shm' if os.path.isdir('/dev/shm') else None)
+    os.chdir(dirname)
+
+    try:
+        yield dirname
+    finally:
+        os.chdir(origin)
+        shutil.rmtree(dirname)
+
+
+class TestCase(unittest.TestCase):
+    r'''
+Run each test in its own temporary working directory.
+    '''
+
+    def setUp(self):
+        context = tempdir()
+        context.__enter__()
+        self.addCleanup(context.__exit__, None, None, None)
+
+
+class Test_tools(TestCase):
 
     def test_flatten(self):
 
@@ -50,16 +84,107 @@ class Test_tools(unittest.TestCase):
 
         self.assertEqual(sorted(ret), sorted(d))
 
+    def test_isfile(self):
 
-class Test_checksum(unittest.TestCase):
+        os.mkdir('mytools')
+        os.mkdir('mytools/sub')
 
-    def test_basic(self):
+        put('mytools/foo.txt', 'foo')
+
+        paths = ['mytools/foo.txt', 'mytools/bar.txt', 'mytools/sub', 'mytools/sub/foo.txt', 'nodir/foo.txt']
+        self.assertEqual(shelephant.path.isfile(paths), [os.path.isfile(path) for path in paths])
+
+        # many paths per directory: the directory is read
+        paths = ['mytools/{0:d}.txt'.format(i) for i in range(20)] + ['mytools/sub'] + paths
+        for path in paths[:10]:
+            put(path, 'foo')
+
+        self.assertEqual(shelephant.path.isfile(paths), [os.path.isfile(path) for path in paths])
+
+        # as on case-insensitive file systems: names not in the listing are stat-ed
+        with unittest.mock.patch.object(shelephant.path, '_insensitive', True):
+            self.assertEqual(shelephant.path.isfile(paths), [os.path.isfile(path) for path in paths])
+
+        shutil.rmtree('mytools')
+
+    def test_copy(self):
+
+        put('foo.txt', 'foo')
+
+        os.utime('foo.txt', (0, 0))
+        shelephant.path.copy('foo.txt', 'bar.txt')
+
+        with open('bar.txt', 'r') as file:
+            self.assertEqual(file.read(), 'foo')
+
+        self.assertEqual(os.stat('bar.txt').st_mtime, 0)
+
+        os.remove('foo.txt')
+        os.remove('bar.txt')
+
+
+class Test_yaml(TestCase):
+
+    def test_read_item(self):
+
+        put('nested.yaml', '\n'.join([
+            'foo: [1, 2]',
+            'bar:',
+            '    foo: &anchor [3, 4]',
+            '    bar: 5',
+            'alias: *anchor',
+            'base: &base',
+            '    a: 1',
+            '    b: 2',
+            'merged:',
+            '    <<: *base',
+            '    b: 3',
+            'duplicate: 1',
+            'duplicate: 2',
+            '1: integer',
+        ]))
+
+        items = {
+            'foo': [1, 2],
+            'bar/foo': [3, 4],
+            'bar/bar': 5,
+            'alias': [3, 4],
+            'merged': {'a': 1, 'b': 3},
+            'merged/a': 1,
+            'merged/b': 3,
+            'duplicate': 2,
+        }
+
+        data = shelephant.yaml.read('nested.yaml')
+
+        for key, value in items.items():
+            self.assertEqual(shelephant.yaml.read_item('nested.yaml', key), value)
+            self.assertEqual(shelephant.yaml.read_item('nested.yaml', key.split('/')), value)
+            self.assertEqual(shelephant.convert.get(data, key.split('/')), value)
+
+        for key in ['nope', 'bar/nope', 'foo/nope', 'bar/bar/nope', '1']:
+            with self.assertRaises(IOError):
+                shelephant.yaml.read_item('nested.yaml', key)
+
+        self.assertEqual(shelephant.yaml.read_item('nested.yaml'), data)
+
+        put('list.yaml', '- foo\n- bar\n')
+
+        self.assertEqual(shelephant.yaml.read_item('list.yaml'), ['foo', 'bar'])
+
+        with self.assertRaises(IOError):
+            shelephant.yaml.read_item('list.yaml', 'foo')
+
+        os.remove('nested.yaml')
+        os.remove('list.yaml')
+
+
+class Test_checksum(TestCase):
 
-        with open('foo.txt', 'w') as file:
-            file.write('foo')
+    def test_basic(self):
 
-        with open('bar.txt', 'w') as file:
-            file.write('bar')
+        put('foo.txt', 'foo')
+        put('bar.txt', 'bar')
 
         output = run('shelephant_dump -f foo.txt bar.txt')
         output = run('shelephant_checksum -f -q shelephant_dump.yaml')
@@ -77,13 +202,33 @@ class Test_checksum(unittest.TestCase):
         os.remove('shelephant_dump.yaml')
         os.remove('shelephant_checksum.yaml')
 
-    def test_hybrid(self):
+    def test_many(self):
+
+        files = ['{0:d}.txt'.format(i) for i in range(20)]
+
+        for i, file in enumerate(files):
+            put(file, 'foo' * i)
+
+        keys = [hashlib.sha256(('foo' * i).encode('utf-8')).hexdigest() for i in range(len(files))]
 
-        with open('foo.txt', 'w') as file:
-            file.write('foo')
+        # computed in parallel: the files are distributed over several tasks
+        submit = concurrent.futures.ProcessPoolExecutor.submit
 
-        with open('bar.txt', 'w') as file:
-            file.write('bar')
+        with unittest.mock.patch.object(
+                concurrent.futures.ProcessPoolExecutor, 'submit', autospec=True, side_effect=submit) as mock:
+            self.assertEqual(shelephant.checksum.get(files, workers=2, cache=False), keys)
+            self.assertGreater(mock.call_count, 1)
+
+        # computed in this process
+        self.assertEqual(shelephant.checksum.get(files, workers=1, cache=False), keys)
+
+        for file in files:
+            os.remove(file)
+
+    def test_hybrid(self):
+
+        put('foo.txt', 'foo')
+        put('bar.txt', 'bar')
 
         output = run('shelephant_dump -f foo.txt')
         output = run('shelephant_checksum -f -q')
@@ -111,8 +256,7 @@ class Test_checksum(unittest.TestCase):
         letters = ['a', 'b', 'c', 'd', 'e', 'f', 'g']
 
         for letter in letters:
-            with open('{0:s}.txt'.format(letter), 'w') as file:
-                file.write(letter)
+            put('{0:s}.txt'.format(letter), letter)
 
         files = ['{0:s}.txt'.format(letter) for letter in letters]
 
@@ -160,16 +304,76 @@ class Test_checksum(unittest.TestCase):
         os.remove('shelephant_checksum.yaml')
         os.remove('shelephant_hostinfo.yaml')
 
+    def test_cache(self):
 
-class Test_dump(unittest.TestCase):
+        environ = unittest.mock.patch.dict(os.environ, {'XDG_CACHE_HOME': os.path.abspath('mycache')})
+        environ.start()
+        self.addCleanup(environ.stop)
+
+        put('foo.txt', 'foo')
+        put('bar.txt', 'bar')
+
+        keys = [
+            '2c26b46b68ffc68ff99b453c1d30413413422d706483bfa0f98a5e886266e7ae',
+            'fcde2b2edba56bf408601fb721fe9b5c338d10ee429ea04fae5511b68fbf8fb9',
+        ]
+
+        files = ['foo.txt', 'bar.txt']
+        stats = [os.stat(file) for file in files]
+
+        # reading does not create the cache
+        self.assertEqual(shelephant.hashcache.read(stats), [None, None])
+        self.assertFalse(os.path.exists('mycache'))
+
+        # recently modified files are not cached
+        self.assertEqual(shelephant.checksum.get(files), keys)
+        self.assertEqual(shelephant.hashcache.read(stats), [None, None])
+
+        # cached checksums are used (store fake checksums, as if computed an hour later)
+        shelephant.hashcache.write(stats, ['foo', 'bar'], time.time_ns() + 3600 * 10 ** 9)
+        self.assertEqual(shelephant.hashcache.read(stats), ['foo', 'bar'])
+        self.assertEqual(shelephant.checksum.get(files), ['foo', 'bar'])
+        self.assertEqual(shelephant.checksum.get(files, cache=False), keys)
+
+        output = run('shelephant_dump -f foo.txt bar.txt')
+        output = run('shelephant_checksum -f -q')
+        self.assertEqual(shelephant.yaml.read('shelephant_checksum.yaml'), ['foo', 'bar'])
+        output = run('shelephant_checksum -f -q --no-cache')
+        self.assertEqual(shelephant.yaml.read('shelephant_checksum.yaml'), keys)
+
+        # the cache is invalidated by a change of content,
+        # even if the size and the modification time are restored
+        time.sleep(0.1)
+        put('foo.txt', 'bar')
+        os.utime('foo.txt', ns=(stats[0].st_atime_ns, stats[0].st_mtime_ns))
+
+        self.assertEqual(shelephant.hashcache.read([os.stat('foo.txt')]), [None])
+        self.assertEqual(shelephant.checksum.get(files), [keys[1], 'bar'])
+
+        os.remove('foo.txt')
+        os.remove('bar.txt')
+        os.remove('shelephant_dump.yaml')
+        os.remove('shelephant_checksum.yaml')
+        shutil.rmtree('mycache')
 
-    def test_basic(self):
 
-        with open('foo.txt', 'w') as file:
-            file.write('foo')
+class Test_dump(TestCase):
 
-        with open('bar.txt', 'w') as file:
-            file.write('bar')
+    def test_console_script(self):
+
+        put('foo.txt', 'foo')
+
+        output = subprocess.check_output('shelephant_dump -f *.txt', shell=True)
+
+        self.assertEqual(shelephant.yaml.read('shelephant_dump.yaml'), ['foo.txt'])
+
+        os.remove('foo.txt')
+        os.remove('shelephant_dump.yaml')
+
+    def test_basic(self):
+
+        put('foo.txt', 'foo')
+        put('bar.txt', 'bar')
 
         for dirname in ['mydir']:
             if os.path.isdir(dirname):
@@ -177,11 +381,8 @@ class Test_dump(unittest.TestCase):
 
         os.mkdir('mydir')
 
-        with open('mydir/foo.txt', 'w') as file:
-            file.write('foo')
-
-        with open('mydir/bar.txt', 'w') as file:
-            file.write('bar')
+        put('mydir/foo.txt', 'foo')
+        put('mydir/bar.txt', 'bar')
 
         output = run('shelephant_dump -f -s -o dump_1.yaml foo.txt bar.txt')
         output = run('shelephant_dump -f -s -o dump_2.yaml *.txt')
@@ -207,17 +408,10 @@ class Test_dump(unittest.TestCase):
 
     def test_append(self):
 
-        with open('foo.txt', 'w') as file:
-            file.write('foo')
-
-        with open('bar.txt', 'w') as file:
-            file.write('bar')
-
-        with open('foo.pdf', 'w') as file:
-            file.write('foo')
-
-        with open('bar.pdf', 'w') as file:
-            file.write('bar')
+        put('foo.txt', 'foo')
+        put('bar.txt', 'bar')
+        put('foo.pdf', 'foo')
+        put('bar.pdf', 'bar')
 
         output = run('shelephant_dump -f foo.txt bar.txt')
         output = run('shelephant_dump -a foo.pdf bar.pdf')
@@ -231,7 +425,7 @@ class Test_dump(unittest.TestCase):
         os.remove('shelephant_dump.yaml')
 
 
-class Test_extract(unittest.TestCase):
+class Test_extract(TestCase):
 
     def test_single_path(self):
 
@@ -292,15 +486,12 @@ class Test_extract(unittest.TestCase):
         os.remove('dump.yaml')
 
 
-class Test_merge(unittest.TestCase):
+class Test_merge(TestCase):
 
     def test_basic(self):
 
-        with open('foo.txt', 'w') as file:
-            file.write('foo')
-
-        with open('bar.txt', 'w') as file:
-            file.write('bar')
+        put('foo.txt', 'foo')
+        put('bar.txt', 'bar')
 
         output = run('shelephant_dump -o main.yaml foo.txt')
         output = run('shelephant_dump -o branch.yaml bar.txt')
@@ -316,17 +507,10 @@ class Test_merge(unittest.TestCase):
         os.mkdir('dira')
         os.mkdir('dirb')
 
-        with open('dira/foo.txt', 'w') as file:
-            file.write('foo')
-
-        with open('dira/bar.txt', 'w') as file:
-            file.write('bar')
-
-        with open('dirb/foo.txt', 'w') as file:
-            file.write('foo')
-
-        with open('dirb/bar.txt', 'w') as file:
-            file.write('bar')
+        put('dira/foo.txt', 'foo')
+        put('dira/bar.txt', 'bar')
+        put('dirb/foo.txt', 'foo')
+        put('dirb/bar.txt', 'bar')
 
         output = run('shelephant_dump -o dira/dump.yaml dira/foo.txt dira/bar.txt')
         output = run('shelephant_dump -o dirb/dump.yaml dirb/foo.txt dirb/bar.txt')
@@ -338,7 +522,7 @@ class Test_merge(unittest.TestCase):
         shutil.rmtree('dirb')
 
 
-class Test_hostinfo(unittest.TestCase):
+class Test_hostinfo(TestCase):
 
     def test_basic(self):
 
@@ -349,11 +533,8 @@ class Test_hostinfo(unittest.TestCase):
         os.mkdir('mysrc')
         os.mkdir('mydest')
 
-        with open('mysrc/foo.txt', 'w') as file:
-            file.write('foo')
-
-        with open('mysrc/bar.txt', 'w') as file:
-            file.write('bar')
+        put('mysrc/foo.txt', 'foo')
+        put('mysrc/bar.txt', 'bar')
 
         output = run('shelephant_dump -f -s -o mysrc/files.yaml mysrc/*.txt')
         output = run('shelephant_checksum -q -o mysrc/checksum.yaml mysrc/files.yaml')
@@ -371,11 +552,8 @@ class Test_hostinfo(unittest.TestCase):
 
     def test_remove(self):
 
-        with open('foo.txt', 'w') as file:
-            file.write('foo')
-
-        with open('bar.txt', 'w') as file:
-            file.write('bar')
+        put('foo.txt', 'foo')
+        put('bar.txt', 'bar')
 
         keys = [
             '2c26b46b68ffc68ff99b453c1d30413413422d706483bfa0f98a5e886266e7ae',
@@ -398,7 +576,26 @@ class Test_hostinfo(unittest.TestCase):
         os.remove('shelephant_hostinfo.yaml')
 
 
-class Test_get(unittest.TestCase):
+class Test_get(TestCase):
+
+    def test_copy_ssh_workers(self):
+
+        files = ['{0:d}.txt'.format(i) for i in range(20)]
+
+        for workers in [1, 4, None]:
+
+            copied = []
+
+            def copy_function(host, src, dest, verbose):
+                copied.append(os.path.basename(dest))
+
+            shelephant.detail.copy_ssh(copy_function, False, 'myhost', files, 'mysrc', 'mydest',
+                to_remote=False, quiet=True, force=True, print_details=False, print_summary=False,
+                workers=workers)
+
+            self.assertEqual(sorted(copied), sorted(files))
+
+        shutil.rmtree('mydest')
 
     def test_basic(self):
 
@@ -409,11 +606,8 @@ class Test_get(unittest.TestCase):
         os.mkdir('mysrc')
         os.mkdir('mydest')
 
-        with open('mysrc/foo.txt', 'w') as file:
-            file.write('foo')
-
-        with open('mysrc/bar.txt', 'w') as file:
-            file.write('bar')
+        put('mysrc/foo.txt', 'foo')
+        put('mysrc/bar.txt', 'bar')
 
         operations = [
             'bar.txt -> bar.txt',
@@ -445,11 +639,8 @@ class Test_get(unittest.TestCase):
         os.mkdir('mysrc')
         os.mkdir('mydest')
 
-        with open('mysrc/foo.txt', 'w') as file:
-            file.write('foo')
-
-        with open('mysrc/bar.txt', 'w') as file:
-            file.write('bar')
+        put('mysrc/foo.txt', 'foo')
+        put('mysrc/bar.txt', 'bar')
 
         shutil.copy('mysrc/foo.txt', 'mydest/foo.txt')
 
@@ -483,17 +674,10 @@ class Test_get(unittest.TestCase):
         os.mkdir('mysrc')
         os.mkdir('mydest')
 
-        with open('mysrc/foo.txt', 'w') as file:
-            file.write('foo')
-
-        with open('mysrc/bar.txt', 'w') as file:
-            file.write('bar')
-
-        with open('mysrc/car.txt', 'w') as file:
-            file.write('car')
-
-        with open('mysrc/dog.txt', 'w') as file:
-            file.write('dog')
+        put('mysrc/foo.txt', 'foo')
+        put('mysrc/bar.txt', 'bar')
+        put('mysrc/car.txt', 'car')
+        put('mysrc/dog.txt', 'dog')
 
         shutil.copy('mysrc/foo.txt', 'mydest/foo.txt')
         shutil.copy('mysrc/dog.txt', 'mydest/dog.txt')
@@ -533,11 +717,8 @@ class Test_get(unittest.TestCase):
         os.mkdir('mysrc')
         os.mkdir('mydest')
 
-        with open('mysrc/foo.txt', 'w') as file:
-            file.write('foo')
-
-        with open('mysrc/bar.txt', 'w') as file:
-            file.write('bar')
+        put('mysrc/foo.txt', 'foo')
+        put('mysrc/bar.txt', 'bar')
 
         shutil.copy2('mysrc/foo.txt', 'mydest/foo.txt')
 
@@ -564,7 +745,7 @@ class Test_get(unittest.TestCase):
         os.remove('shelephant_files.txt')
 
 
-class Test_send(unittest.TestCase):
+class Test_send(TestCase):
 
     def test_basic(self):
 
@@ -575,14 +756,9 @@ class Test_send(unittest.TestCase):
         os.mkdir('mysrc')
         os.mkdir('mydest')
 
-        with open('mysrc/foo.txt', 'w') as file:
-            file.write('foo')
-
-        with open('mysrc/bar.txt', 'w') as file:
-            file.write('bar')
-
-        with open('mydest/foobar.txt', 'w') as file:
-            file.write('foobar')
+        put('mysrc/foo.txt', 'foo')
+        put('mysrc/bar.txt', 'bar')
+        put('mydest/foobar.txt', 'foobar')
 
         operations = [
             'bar.txt -> bar.txt',
@@ -619,11 +795,8 @@ class Test_send(unittest.TestCase):
         os.mkdir('mysrc')
         os.mkdir('mydest')
 
-        with open('mysrc/foo.txt', 'w') as file:
-            file.write('foo')
-
-        with open('mysrc/bar.txt', 'w') as file:
-            file.write('bar')
+        put('mysrc/foo.txt', 'foo')
+        put('mysrc/bar.txt', 'bar')
 
         operations = [
             'bar.txt -> bar.txt',
@@ -656,11 +829,8 @@ class Test_send(unittest.TestCase):
         os.mkdir('mysrc')
         os.mkdir('mydest')
 
-        with open('mysrc/foo.txt', 'w') as file:
-            file.write('foo')
-
-        with open('mysrc/bar.txt', 'w') as file:
-            file.write('bar')
+        put('mysrc/foo.txt', 'foo')
+        put('mysrc/bar.txt', 'bar')
 
         shutil.copy('mysrc/foo.txt', 'mydest/foo.txt')
 
@@ -697,17 +867,10 @@ class Test_send(unittest.TestCase):
         os.mkdir('mysrc')
         os.mkdir('mydest')
 
-        with open('mysrc/foo.txt', 'w') as file:
-            file.write('foo')
-
-        with open('mysrc/bar.txt', 'w') as file:
-            file.write('bar')
-
-        with open('mysrc/car.txt', 'w') as file:
-            file.write('car')
-
-        with open('mysrc/dog.txt', 'w') as file:
-            file.write('dog')
+        put('mysrc/foo.txt', 'foo')
+        put('mysrc/bar.txt', 'bar')
+        put('mysrc/car.txt', 'car')
+        put('mysrc/dog.txt', 'dog')
 
         shutil.copy('mysrc/foo.txt', 'mydest/foo.txt')
         shutil.copy('mysrc/dog.txt', 'mydest/dog.txt')
@@ -749,11 +912,8 @@ class Test_send(unittest.TestCase):
         os.mkdir('mysrc')
         os.mkdir('mydest')
 
-        with open('mysrc/foo.txt', 'w') as file:
-            file.write('foo')
-
-        with open('mysrc/bar.txt', 'w') as file:
-            file.write('bar')
+        put('mysrc/foo.txt', 'foo')
+        put('mysrc/bar.txt', 'bar')
 
         shutil.copy2('mysrc/foo.txt', 'mydest/foo.txt')
 
@@ -781,7 +941,7 @@ class Test_send(unittest.TestCase):
         os.remove('shelephant_files.txt')
 
 
-class Test_mv(unittest.TestCase):
+class Test_mv(TestCase):
 
     def test_basic(self):
 
@@ -792,11 +952,8 @@ class Test_mv(unittest.TestCase):
         os.mkdir('mysrc')
         os.mkdir('mydest')
 
-        with open('mysrc/foo.txt', 'w') as file:
-            file.write('foo')
-
-        with open('mysrc/bar.txt', 'w') as file:
-            file.write('bar')
+        put('mysrc/foo.txt', 'foo')
+        put('mysrc/bar.txt', 'bar')
 
         output = run('shelephant_dump -o mysrc/files.yaml mysrc/*.txt')
         output = run('shelephant_checksum -q -o mysrc/checksum.yaml mysrc/files.yaml')
@@ -811,7 +968,7 @@ class Test_mv(unittest.TestCase):
         shutil.rmtree('mydest')
 
 
-class Test_cp(unittest.TestCase):
+class Test_cp(TestCase):
 
     def test_basic(self):
 
@@ -822,11 +979,8 @@ class Test_cp(unittest.TestCase):
         os.mkdir('mysrc')
         os.mkdir('mydest')
 
-        with open('mysrc/foo.txt', 'w') as file:
-            file.write('foo')
-
-        with open('mysrc/bar.txt', 'w') as file:
-            file.write('bar')
+        put('mysrc/foo.txt', 'foo')
+        put('mysrc/bar.txt', 'bar')
 
         output = run('shelephant_dump -o mysrc/files.yaml mysrc/*.txt')
         output = run('shelephant_checksum -q -o mysrc/checksum.yaml mysrc/files.yaml')
@@ -842,6 +996,39 @@ class Test_cp(unittest.TestCase):
         shutil.rmtree('mysrc')
         shutil.rmtree('mydest')
 
+    def test_many(self):
+
+        os.mkdir('mysrc')
+
+        files = ['mysrc/{0:d}.txt'.format(i) for i in range(20)]
+
+        for i, file in enumerate(files):
+            put(file, 'foo' * i)
+
+        output = run('shelephant_dump -s -o mysrc/files.yaml mysrc/*.txt')
+        output = run('shelephant_cp -f -q --workers 4 mysrc/files.yaml mydest')
+
+        for file in files:
+            with open(file, 'r') as a, open(file.replace('mysrc', 'mydest'), 'r') as b:
+                self.assertEqual(a.read(), b.read())
+
+        # on error: raise and cancel the copies that did not start yet
+        copied = []
+
+        def copy_function(src, dest):
+            copied.append(src)
+            raise OSError('No space left on device')
+
+        with self.assertRaises(OSError):
+            shelephant.detail.copy(copy_function, files, '', 'mydest2', quiet=True, force=True,
+                print_details=False, print_summary=False, workers=2)
+
+        self.assertLess(len(copied), len(files))
+
+        shutil.rmtree('mysrc')
+        shutil.rmtree('mydest')
+        shutil.rmtree('mydest2')
+
     def test_rsync(self):
 
         for dirname in ['mysrc', 'mydest']:
@@ -851,11 +1038,8 @@ class Test_cp(unittest.TestCase):
         os.mkdir('mysrc')
         os.mkdir('mydest')
 
-        with open('mysrc/foo.log', 'w') as file:
-            file.write('foo')
-
-        with open('mysrc/bar.log', 'w') as file:
-            file.write('bar')
+        put('mysrc/foo.log', 'foo')
+        put('mysrc/bar.log', 'bar')
 
         shutil.copy2('mysrc/foo.log', 'mydest/foo.log')
 
@@ -890,17 +1074,10 @@ class Test_cp(unittest.TestCase):
 
         os.makedirs('mysrc/foo/foo/foo')
 
-        with open('mysrc/foo.log', 'w') as file:
-            file.write('foo')
-
-        with open('mysrc/foo/foo.log', 'w') as file:
-            file.write('foo')
-
-        with open('mysrc/foo/foo/foo.log', 'w') as file:
-            file.write('foo')
-
-        with open('mysrc/foo/foo/foo/foo.log', 'w') as file:
-            file.write('foo')
+        put('mysrc/foo.log', 'foo')
+        put('mysrc/foo/foo.log', 'foo')
+        put('mysrc/foo/foo/foo.log', 'foo')
+        put('mysrc/foo/foo/foo/foo.log', 'foo')
 
         operations = [
             'mysrc/foo.log             -> mysrc/foo.log',
@@ -923,15 +1100,12 @@ class Test_cp(unittest.TestCase):
         shutil.rmtree('mybak')
 
 
-class Test_rm(unittest.TestCase):
+class Test_rm(TestCase):
 
     def test_basic(self):
 
-        with open('foo.txt', 'w') as file:
-            file.write('foo')
-
-        with open('bar.txt', 'w') as file:
-            file.write('bar')
+        put('foo.txt', 'foo')
+        put('bar.txt', 'bar')
 
         output = run('shelephant_dump -f foo.txt bar.txt')
         output = run('shelephant_rm -f shelephant_dump.yaml')
@@ -942,15 +1116,12 @@ class Test_rm(unittest.TestCase):
         os.remove('shelephant_dump.yaml')
 
 
-class Test_parse(unittest.TestCase):
+class Test_parse(TestCase):
 
     def test_basic(self):
 
-        with open('foo.txt', 'w') as file:
-            file.write('foo')
-
-        with open('bar.txt', 'w') as file:
-            file.write('bar')
+        put('foo.txt', 'foo')
+        put('bar.txt', 'bar')
 
         output = run('shelephant_dump -f foo.txt bar.txt')
         output = run('shelephant_parse shelephant_dump.yaml')
@@ -13,15 +13,11 @@ Options:
 (c - MIT) T.W.J. de Geus | tom@geus.me | www.geus.me | github.com/tdegeus/shelephant
 '''
 
-import subprocess
 import docopt
 import os
 import shelephant
 
-
-def run(cmd):
-    print(cmd)
-    return subprocess.check_output(cmd, shell=True).decode('utf-8')
+from _helpers import run
 
 
 args = docopt.docopt(__doc__, version=shelephant.version)
@@ -35,10 +31,10 @@ operations = [
 
 output = run(('shelephant_hostinfo -o myssh_send/shelephant_hostinfo.yaml --force '
               '--host "{0:s}" --prefix "{1:s}" -f -c').format(
-               args['--host'], os.path.join(args['--prefix'], 'myssh_get')))
+               args['--host'], os.path.join(args['--prefix'], 'myssh_get')), verbose=True)
 
 output = run(('shelephant_send --detail --colors none --force '
-              'myssh_send/shelephant_dump.yaml myssh_send/shelephant_hostinfo.yaml'))
+              'myssh_send/shelephant_dump.yaml myssh_send/shelephant_hostinfo.yaml'), verbose=True)
 
 output = list(filter(None, output.split('\n')))
 assert output == operations
@@ -52,13 +48,13 @@ operations = [
 
 output = run(('shelephant_hostinfo -o myssh_send/shelephant_hostinfo.yaml --force '
               '--host "{0:s}" --prefix "{1:s}" -f -c').format(
-              args['--host'], os.path.join(args['--prefix'], 'myssh_get')))
+              args['--host'], os.path.join(args['--prefix'], 'myssh_get')), verbose=True)
 
 output = run(('shelephant_hostinfo -o myssh_send/shelephant_local.yaml --force '
-              '-f myssh_send/shelephant_dump.yaml -c myssh_send/shelephant_checksum.yaml'))
+              '-f myssh_send/shelephant_dump.yaml -c myssh_send/shelephant_checksum.yaml'), verbose=True)
 
 output = run(('shelephant_send --detail --colors none --force '
-              'myssh_send/shelephant_dump.yaml myssh_send/shelephant_hostinfo.yaml'))
+              'myssh_send/shelephant_dump.yaml myssh_send/shelephant_hostinfo.yaml'), verbose=True)
 
 output = list(filter(None, output.split('\n')))
 assert output == operations
@@ -72,9 +68,9 @@ operations = [
 
 output = run(('shelephant_hostinfo -o myssh_get/shelephant_hostinfo.yaml --force '
               '--host "{0:s}" --prefix "{1:s}" -f -c').format(
-              args['--host'], os.path.join(args['--prefix'], 'myssh_send')))
+              args['--host'], os.path.join(args['--prefix'], 'myssh_send')), verbose=True)
 
-output = run('shelephant_get --detail --colors none --force myssh_get/shelephant_hostinfo.yaml')
+output = run('shelephant_get --detail --colors none --force myssh_get/shelephant_hostinfo.yaml', verbose=True)
 
 output = list(filter(None, output.split('\n')))
 assert output == operations